@@ -555,8 +555,7 @@ def autonomous_client_command():
     except Exception:
         pass
     try:
-        from autonomous_adapter import run_autonomous_agent, build_demo_config
-        from autonomous_adapter.trigger_agentpay import trigger_hire_by_capability
+        from autonomous_adapter import run_autonomous_agent, build_demo_config, trigger_hire_by_capability
     except ImportError as e:
         print("autonomous_adapter required. Run from repo root: pip install -e .")
         sys.exit(1)
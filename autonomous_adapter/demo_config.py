@@ -74,7 +74,7 @@ def build_demo_config(
       When provided, we post this offer once before the loop and store it so we can trigger hire later.
     """
     # Prefer .env file so ENS is not truncated by shell. We use the full value (no slicing).
-    raw = (my_ens or _ens_from_env_file() or os.getenv("AGENTPAY_ENS_NAME") or "").strip().rstrip(".eth").replace("\r", "").replace("\n", "").strip()
+    raw = (my_ens or _ens_from_env_file() or os.getenv("AGENTPAY_ENS_NAME") or "").replace("\r", "").replace("\n", "").strip().removesuffix(".eth")
     my_ens = raw
     if role == "worker" and not my_ens:
         my_ens = "worker"
@@ -109,6 +109,8 @@ def build_demo_config(
             "on_offer": on_offer,
             "on_accept": on_accept,
             "poll_interval_seconds": poll_interval_seconds,
+            "self_ens": ens_suffix,
+            "self_kinds": ("accept",),  # the client may share our ENS: its offers are still for us
         }
         return config
 
@@ -162,11 +164,17 @@ def build_demo_config(
     def on_offer(_: Dict[str, Any]) -> None:
         pass
 
+    # Our offer goes out with this ENS (initial_offer poster_ens, else ours, else "client"):
+    # it is what the feed echoes back, so it is what we must recognise as ourselves.
+    poster_ens = ((initial_offer or {}).get("poster_ens") or my_ens or "client").strip().removesuffix(".eth")
+
     config = {
         "feed_provider": feed_provider,
         "on_offer": on_offer,
         "on_accept": on_accept,
         "poll_interval_seconds": poll_interval_seconds,
+        "self_ens": f"{poster_ens}.eth",
+        "self_kinds": ("offer",),  # the worker may share our ENS: its accepts are still for us
         "_hire_result": hire_result,
     }
 
@@ -174,7 +182,6 @@ def build_demo_config(
         task_type = initial_offer.get("task_type") or "analyze-data"
         price = initial_offer.get("price") or "0.05 AP"
         input_data = initial_offer.get("input_data") or {"query": "Demo task"}
-        poster_ens = initial_offer.get("poster_ens") or my_ens or "client"
         text = format_offer_text(task_type, price, initial_offer.get("input_ref"), poster_ens)
         full_text = input_data.get("query") or input_data.get("text") or ""
         created = feed_client.post_offer(text, full_text=full_text if full_text else None)
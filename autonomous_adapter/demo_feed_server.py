@@ -2,6 +2,7 @@
 Minimal demo feed server for the autonomous AgentPay demo.
 
 GET /feed  -> list of posts (each: id, text, thread_id, created_at)
+GET /thread/<thread_id> -> posts in one thread (offer + replies), in order
 POST /feed -> body { "text", "thread_id"? } -> appends post, returns { "id", ... }
 
 No Moltbook API key required. Use so two Moltbots (or two terminals) can share
@@ -16,9 +17,12 @@ import os
 import uuid
 from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
 
 
 FEED: list = []  # in-memory; each item: { id, text, thread_id, created_at }
+THREADS: dict = {}  # thread_id -> items in FEED for that thread, so thread views skip the full scan
+STREAM_CHUNK_BYTES = 64 * 1024  # GET responses are written in chunks of about this size
 
 
 def _cors_headers():
@@ -42,6 +46,28 @@ class FeedHandler(BaseHTTPRequestHandler):
         self.end_headers()
         self.wfile.write(json.dumps(data).encode("utf-8"))
 
+    def _send_posts(self, posts: list):
+        """
+        Send {"posts": [...]} without building the whole body in memory: posts are
+        encoded one by one and written out in STREAM_CHUNK_BYTES pieces. No
+        Content-Length, so (HTTP/1.0) the end of the body is the connection close.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        for k, v in _cors_headers().items():
+            self.send_header(k, v)
+        self.end_headers()
+        buf = bytearray(b'{"posts": [')
+        for i, post in enumerate(posts):
+            if i:
+                buf += b", "
+            buf += json.dumps(post).encode("utf-8")
+            if len(buf) >= STREAM_CHUNK_BYTES:
+                self.wfile.write(buf)
+                buf.clear()
+        buf += b"]}"
+        self.wfile.write(buf)
+
     def do_OPTIONS(self):
         self.send_response(204)
         for k, v in _cors_headers().items():
@@ -50,14 +76,19 @@ class FeedHandler(BaseHTTPRequestHandler):
         self.end_headers()
 
     def do_GET(self):
-        if self.path.rstrip("/") == "/feed":
-            self._send_json(200, {"posts": FEED})
+        path = self.path.rstrip("/")
+        if path == "/feed":
+            self._send_posts(FEED)
+            return
+        if path.startswith("/thread/"):
+            thread_id = unquote(path[len("/thread/"):])
+            self._send_posts(THREADS.get(thread_id, []))
             return
-        if self.path.rstrip("/") in ("", "/"):
+        if path in ("", "/"):
             self.send_response(200)
             self.send_header("Content-Type", "text/plain")
             self.end_headers()
-            self.wfile.write(b"AgentPay demo feed. GET /feed or POST /feed\n")
+            self.wfile.write(b"AgentPay demo feed. GET /feed, GET /thread/<id> or POST /feed\n")
             return
         self.send_response(404)
         self.end_headers()
@@ -69,7 +100,8 @@ class FeedHandler(BaseHTTPRequestHandler):
             return
         try:
             length = int(self.headers.get("Content-Length", 0))
-            body = self.rfile.read(length).decode("utf-8") if length else "{}"
+            # json.loads takes bytes directly; no need to decode the whole body first
+            body = self.rfile.read(length) if length else b"{}"
             data = json.loads(body) if body.strip() else {}
         except (ValueError, json.JSONDecodeError):
             self._send_json(400, {"error": "Invalid JSON"})
@@ -85,6 +117,7 @@ class FeedHandler(BaseHTTPRequestHandler):
         full_text = (data.get("full_text") or "").strip()
         item = {"id": post_id, "text": text, "thread_id": thread_id, "created_at": now}
         FEED.append(item)
+        THREADS.setdefault(str(thread_id), []).append(item)
         # Show in feed terminal: full text if short (so ENS never cut), else preview. Flush so order is visible.
         one_line = text.replace("\n", " ").strip()
         if len(one_line) <= 250:
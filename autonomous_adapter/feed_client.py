@@ -40,20 +40,17 @@ def get_recent_posts() -> List[Dict[str, Any]]:
     posts = data.get("posts") if isinstance(data, dict) else []
     if not isinstance(posts, list):
         return []
-    # Normalize for adapter: each item needs "text" or "body"
+    # Normalize for adapter: each item needs "text" or "body".
+    # Posts are freshly decoded, so normalize them in place rather than copying.
     out = []
     for p in posts:
         if not isinstance(p, dict):
             continue
         text = p.get("text") or p.get("body") or ""
-        out.append({
-            "id": p.get("id"),
-            "text": text,
-            "body": text,
-            "thread_id": p.get("thread_id") or p.get("id"),
-            "created_at": p.get("created_at"),
-            **p,
-        })
+        p["text"] = text
+        p["body"] = text
+        p["thread_id"] = p.get("thread_id") or p.get("id")
+        out.append(p)
     return out
 
 
@@ -2,11 +2,15 @@
 Parse Moltbook (or feed) posts for AgentPay offers and accepts.
 
 Convention: see agentpay/docs/MOLTBOOK_CONVENTION.md.
+
+This module is fully annotated so it can be AOT-compiled with mypyc
+(``mypyc autonomous_adapter/parse_agentpay_intent.py``); the resulting
+extension is picked up by import automatically and the .py stays the fallback.
 """
 
 import re
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Optional
 
 
 @dataclass
@@ -67,7 +71,7 @@ def parse_offer(text: str) -> Optional[AgentPayOffer]:
     m = OFFER_BLOCK_RE.search(text)
     if m:
         block = m.group(1).strip()
-        kv = dict(KEY_VALUE_RE.findall(block))
+        kv: Dict[str, str] = dict(KEY_VALUE_RE.findall(block))
         task = (kv.get("task") or "").strip()
         ens = (kv.get("ens") or "").strip()
         if ens and not ens.endswith(".eth"):
@@ -111,7 +115,7 @@ def parse_accept(text: str) -> Optional[AgentPayAccept]:
     m = ACCEPT_BLOCK_RE.search(text)
     if m:
         block = m.group(1).strip()
-        kv = dict(KEY_VALUE_RE.findall(block))
+        kv: Dict[str, str] = dict(KEY_VALUE_RE.findall(block))
         ens = (kv.get("ens") or "").strip()
         if ens and not ens.endswith(".eth"):
             ens = ens + ".eth"
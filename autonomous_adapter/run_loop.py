@@ -5,6 +5,8 @@ Use this so the agent can read from (and react to) Moltbook from inside a Codesp
 You supply feed_provider (e.g. your Moltbook client); AgentPay does not ship one.
 """
 
+import signal
+import threading
 from typing import Any, Callable, Dict, List, Optional
 
 from .watch_moltbook import watch_moltbook_feed
@@ -26,6 +28,15 @@ def run_autonomous_agent(config: Dict[str, Any]) -> None:
         on_accept: Callable[[dict], None]. Called when an AgentPay accept is parsed.
             Your code can call trigger_hire_from_accept(accept, task_type, input_data).
         poll_interval_seconds: Optional. Default 60.
+        stop_event: Optional threading.Event. Set it to stop the loop; when run
+            from the main thread, SIGTERM sets it too (for the duration of the loop).
+        wake_event: Optional threading.Event. Set it to poll right away (e.g. when
+            a push/webhook says a new post landed). If you pass one, set it along
+            with stop_event to cut the current wait short.
+        self_ens: Optional. This agent's ENS; its own offers/accepts coming back
+            through the feed are skipped instead of dispatched.
+        self_kinds: Optional. Which of its own post kinds to skip ("offer",
+            "accept"); default both.
 
     Example (pseudo):
         config = {
@@ -40,6 +51,10 @@ def run_autonomous_agent(config: Dict[str, Any]) -> None:
     on_accept = config.get("on_accept")
     poll_interval_seconds = config.get("poll_interval_seconds", 60)
     exit_after_first_accept = config.get("exit_after_first_accept", False)
+    stop_event = config.get("stop_event") or threading.Event()
+    wake_event = config.get("wake_event")
+    self_ens = config.get("self_ens")
+    self_kinds = config.get("self_kinds") or ("offer", "accept")
 
     if not callable(on_offer):
         on_offer = _noop
@@ -58,13 +73,31 @@ def run_autonomous_agent(config: Dict[str, Any]) -> None:
         on_accept = _on_accept_wrapper
         should_stop = lambda: done[0]
 
-    watch_moltbook_feed(
-        on_offer=on_offer,
-        on_accept=on_accept,
-        poll_interval_seconds=poll_interval_seconds,
-        feed_provider=feed_provider,
-        should_stop=should_stop,
-    )
+    def _stop(*_: Any) -> None:
+        stop_event.set()
+        if wake_event is not None:
+            wake_event.set()  # cut the current poll wait short
+
+    # signal handlers can only be installed from the main thread (cli runs us in a daemon thread)
+    previous_sigterm = None
+    if threading.current_thread() is threading.main_thread():
+        previous_sigterm = signal.signal(signal.SIGTERM, _stop)
+
+    try:
+        watch_moltbook_feed(
+            on_offer=on_offer,
+            on_accept=on_accept,
+            poll_interval_seconds=poll_interval_seconds,
+            feed_provider=feed_provider,
+            should_stop=should_stop,
+            stop_event=stop_event,
+            wake_event=wake_event,
+            self_ens=self_ens,
+            self_kinds=self_kinds,
+        )
+    finally:
+        if previous_sigterm is not None:
+            signal.signal(signal.SIGTERM, previous_sigterm)
 
 
 def _noop(_: dict) -> None:
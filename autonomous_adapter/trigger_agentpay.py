@@ -5,8 +5,10 @@ Call pay_agent() when the poster sees an accept; or surface instructions
 for the worker to start agentpay worker.
 """
 
+import functools
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Callable, Dict, List, Optional
 
 try:
     from agentpay.tools import pay_agent
@@ -20,6 +22,31 @@ except ImportError:
     AgentWallet = None
     get_pay_fn = None
 
+__all__ = [
+    "trigger_hire",
+    "trigger_hire_from_accept",
+    "trigger_hire_by_capability",
+]
+
+
+_WALLET: Optional["AgentWallet"] = None
+_WALLET_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=8)
+def _pay_fn(payment_method: str) -> Callable:
+    return get_pay_fn(payment_method)
+
+
+def _get_wallet() -> "AgentWallet":
+    """Shared AgentWallet for hires, built on first use so a burst of accepts does not redo wallet setup."""
+    global _WALLET
+    if _WALLET is None:
+        with _WALLET_LOCK:
+            if _WALLET is None:
+                _WALLET = AgentWallet()
+    return _WALLET
+
 
 def trigger_hire_by_capability(
     capability: str,
@@ -27,14 +54,17 @@ def trigger_hire_by_capability(
     task_type: str,
     input_data: Dict[str, Any],
     job_id: Optional[str] = None,
+    wallet: Optional["AgentWallet"] = None,
 ) -> "JobResult":
     """
     Hire by capability: discover first agent that offers the capability, then run 402 flow.
     Set AGENTPAY_KNOWN_AGENTS=ens1.eth,ens2.eth (worker ENS names must have agentpay.capabilities set).
+    Reuses one AgentWallet across calls; pass wallet= to use a different (or fresh) one per hire.
     """
     if hire_agent is None or AgentWallet is None or get_pay_fn is None:
         raise RuntimeError("agentpay not installed. pip install agentpay")
-    wallet = AgentWallet()
+    if wallet is None:
+        wallet = _get_wallet()
     return hire_agent(
         wallet,
         task_type=task_type,
@@ -42,7 +72,7 @@ def trigger_hire_by_capability(
         capability=capability,
         known_agents=known_agents,
         job_id=job_id,
-        pay_fn=get_pay_fn("yellow_full"),
+        pay_fn=_pay_fn("yellow_full"),
     )
 
 
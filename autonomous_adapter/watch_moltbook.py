@@ -6,8 +6,8 @@ that returns feed items from your Moltbook client. AgentPay does not ship
 a Moltbook client; you or Moltbot provide it.
 """
 
-import time
-from typing import Callable, List, Optional
+import threading
+from typing import Callable, Collection, List, Optional
 
 from .parse_agentpay_intent import parse_offer, parse_accept
 
@@ -18,6 +18,10 @@ def watch_moltbook_feed(
     poll_interval_seconds: int = 60,
     feed_provider: Optional[Callable[[], List[dict]]] = None,
     should_stop: Optional[Callable[[], bool]] = None,
+    stop_event: Optional[threading.Event] = None,
+    wake_event: Optional[threading.Event] = None,
+    self_ens: Optional[str] = None,
+    self_kinds: Collection[str] = ("offer", "accept"),
 ) -> None:
     """
     Poll feed, parse posts, call on_offer / on_accept. Exits when should_stop() is True.
@@ -30,14 +34,44 @@ def watch_moltbook_feed(
             Each item should have "text" or "body" (and optionally "id", "thread_id").
             If None, no items are fetched (stub mode for testing).
         should_stop: Optional. If set, called after processing items; when True, loop exits.
+        stop_event: Optional. When set, the loop exits without finishing the
+            current wait (if wake_event is also used, set it too to cut the wait short).
+        wake_event: Optional. When set, the next poll runs right away instead of
+            waiting out poll_interval_seconds (e.g. from a push/webhook path).
+        self_ens: Optional. This agent's ENS. Posts authored by it (offers or accepts
+            carrying this ENS) are skipped, so our own posts never trigger callbacks.
+        self_kinds: Which of our post kinds ("offer", "accept") to skip. A worker only
+            posts accepts and a client only offers; limiting this keeps two demo agents
+            that share one ENS from dropping each other's posts.
     """
-    while True:
+    if stop_event is None:
+        stop_event = threading.Event()
+    if self_ens:
+        self_ens = self_ens.strip().lower()
+        if not self_ens.endswith(".eth"):
+            self_ens = self_ens + ".eth"
+    while not stop_event.is_set():
         items = (feed_provider() if feed_provider else []) or []
         for item in items:
             text = (item.get("text") or item.get("body") or "").strip()
             if not text:
                 continue
+            # Cheap self-filter first; only posts that mention our ENS need a closer look
+            by_us = own = False
+            if self_ens:
+                by_us = (item.get("author_ens") or "").strip().lower() == self_ens
+                own = by_us or self_ens in text.lower()
             o = parse_offer(text)
+            a = parse_accept(text)
+            if own:
+                # The free-form parsers overlap, so go by what the post is: an explicit
+                # [AGENTPAY_ACCEPT] block, else an offer if one parses, else an accept
+                if "[agentpay_accept]" in text.lower() or not o:
+                    kind, ens = "accept", a and a.worker_ens
+                else:
+                    kind, ens = "offer", o.poster_ens
+                if kind in self_kinds and (by_us or (ens or "").lower() == self_ens):
+                    continue
             if o:
                 on_offer({
                     "task_type": o.task_type,
@@ -46,9 +80,12 @@ def watch_moltbook_feed(
                     "input_ref": o.input_ref,
                     "_item": item,
                 })
-            a = parse_accept(text)
             if a:
                 on_accept({"worker_ens": a.worker_ens, "_item": item})
         if should_stop and should_stop():
             return
-        time.sleep(poll_interval_seconds)
+        if wake_event is not None:
+            wake_event.wait(poll_interval_seconds)
+            wake_event.clear()
+        else:
+            stop_event.wait(poll_interval_seconds)
@@ -4,12 +4,22 @@ ENS Domain Registration Script for Sepolia Testnet
 Handles the full commit-reveal registration flow.
 """
 
+import asyncio
+import functools
+import json
 import os
+import random
 import sys
 import time
 import secrets
+import statistics
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
-from eth_abi import encode
+from web3.exceptions import TransactionNotFound
+from eth_abi import encode, decode
 
 # ============== CONFIGURATION ==============
 # Private key from env not just sat there in a file omg!
@@ -27,11 +37,20 @@ if not DOMAIN_NAME:
     raise ValueError("Provide domain name via: AGENTPAY_ENS_NAME env var or command line arg")
 
 RPC_URL = os.environ.get("RPC_URL", "https://ethereum-sepolia-rpc.publicnode.com")
+WS_RPC_URL = os.environ.get("WS_RPC_URL")  # optional: wait for receipts via newHeads instead of polling
 DURATION_SECONDS = 31536000  # 1 year in seconds
+GAS_ESTIMATE_BUFFER = 1.2  # headroom over eth_estimateGas
+REGISTER_GAS_FALLBACK = 300000  # used only if estimating the register tx fails
+REGISTER_ATTEMPTS = 3  # first register tx + fee-bumped resends, all reusing the same commitment
+REGISTER_ATTEMPT_TIMEOUT = 60  # seconds to wait for each register tx before resending
+REGISTER_FEE_BUMP = 1.2  # nodes only accept a same-nonce replacement with >= 10% higher fees
+COMMITMENT_AGE_TTL_SECONDS = 3600  # min/maxCommitmentAge only change by governance
 
 # Sepolia Contract Addresses
 ETH_REGISTRAR_CONTROLLER = "0xFED6a969AaA60E4961FCD3EBF1A2e8913ac65B72"
 PUBLIC_RESOLVER = "0x0000000000000000000000000000000000000000"
+ETH_REGISTRAR_CONTROLLER_CS = Web3.to_checksum_address(ETH_REGISTRAR_CONTROLLER)
+PUBLIC_RESOLVER_CS = Web3.to_checksum_address(PUBLIC_RESOLVER)
 
 # ============== ABIs ==============
 CONTROLLER_ABI = [
@@ -117,10 +136,287 @@ CONTROLLER_ABI = [
 ]
 
 
+@functools.lru_cache(maxsize=2)
+def _get_session(retry_reads: bool = False) -> requests.Session:
+    """
+    Keep-alive HTTP session, so every RPC reuses one TLS connection. With retry_reads,
+    transient gateway errors are retried (JSON-RPC is POST-only): only for _rpc_batch,
+    which sends eth_call reads. Web3's session never retries, so a 502 after an
+    eth_sendRawTransaction reached the node cannot broadcast the tx twice.
+    """
+    session = requests.Session()
+    if retry_reads:
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            status_forcelist=[502, 503, 504],
+            allowed_methods=frozenset(["POST"]),
+        )
+    else:
+        retry = 0
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=4)
+def _get_w3(rpc_url: str = RPC_URL) -> Web3:
+    """One Web3 client per RPC URL, reused by every call in this module."""
+    return Web3(Web3.HTTPProvider(rpc_url, request_kwargs={"timeout": 30}, session=_get_session()))
+
+
+@functools.lru_cache(maxsize=4)
+def _get_controller(rpc_url: str = RPC_URL):
+    """ETHRegistrarController contract handle (ABI parsed once per RPC URL)."""
+    return _get_w3(rpc_url).eth.contract(address=ETH_REGISTRAR_CONTROLLER_CS, abi=CONTROLLER_ABI)
+
+
+# Function selectors and arg types for the controller reads, computed once so each
+# call only encodes its arguments (no per-call ABI lookup or selector hashing).
+SEL_AVAILABLE = Web3.keccak(text="available(string)")[:4]
+SEL_RENT_PRICE = Web3.keccak(text="rentPrice(string,uint256)")[:4]
+SEL_COMMIT = Web3.keccak(text="commit(bytes32)")[:4]
+SEL_MIN_COMMITMENT_AGE = Web3.keccak(text="minCommitmentAge()")[:4]
+SEL_MAX_COMMITMENT_AGE = Web3.keccak(text="maxCommitmentAge()")[:4]
+RENT_PRICE_TYPES = ["string", "uint256"]
+COMMITMENT_TYPES = ["bytes32", "address", "uint256", "bytes32", "address", "bytes[]", "bool", "uint16"]
+
+
+def _calldata(selector: bytes, types: list, args: list) -> str:
+    """ABI-encode a controller call: 4-byte selector + encoded args, as a 0x hex string."""
+    return "0x" + (selector + encode(types, args)).hex()
+
+
+def make_commitment(
+    domain_name: str,
+    owner_address: str,
+    duration_seconds: int,
+    secret: bytes,
+    resolver: str = PUBLIC_RESOLVER_CS,
+    data: Optional[list] = None,
+    reverse_record: bool = False,
+    owner_controlled_fuses: int = 0,
+) -> bytes:
+    """
+    Same value as the controller's (pure) makeCommitment, computed locally:
+    keccak256(abi.encode(keccak256(name), owner, duration, secret, resolver, data, reverseRecord, fuses)).
+    """
+    label_hash = Web3.keccak(text=domain_name)
+    return Web3.keccak(encode(
+        COMMITMENT_TYPES,
+        [label_hash, owner_address, duration_seconds, secret, resolver, data or [], reverse_record, owner_controlled_fuses],
+    ))
+
+
+def _controller_call(selector: bytes, types: list, args: list, out_types: list) -> tuple:
+    """Raw eth_call against the controller, decoded with eth_abi."""
+    result = _get_w3().eth.call({"to": ETH_REGISTRAR_CONTROLLER_CS, "data": _calldata(selector, types, args)})
+    return decode(out_types, bytes(result))
+
+
+def _rpc_batch(calls: list) -> list:
+    """
+    Send several JSON-RPC calls in a single HTTP POST (one round-trip).
+    calls: list of (method, params). Returns the raw results in the same order.
+    """
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+    try:
+        resp = _get_session(retry_reads=True).post(RPC_URL, json=payload, timeout=30)
+        resp.raise_for_status()
+        replies = resp.json()
+    except (requests.RequestException, ValueError) as e:
+        raise ConnectionError("Failed to connect to Sepolia RPC") from e
+    if not isinstance(replies, list):
+        raise ConnectionError(f"RPC does not support batch requests: {replies}")
+    by_id = {r.get("id"): r for r in replies}
+    results = []
+    for i, (method, _) in enumerate(calls):
+        reply = by_id.get(i) or {}
+        if "result" not in reply:
+            raise RuntimeError(f"{method} failed: {reply.get('error')}")
+        results.append(reply["result"])
+    return results
+
+
+def _receipt_if_mined(w3: Web3, tx_hash):
+    """
+    Receipt if the tx is in a block, else None. Checks eth_getTransactionByHash first:
+    it shows blockNumber as soon as the tx is included and is cheaper for the node than
+    a receipt, so the receipt is only fetched once.
+    """
+    try:
+        if w3.eth.get_transaction(tx_hash)["blockNumber"] is None:
+            return None
+        return w3.eth.get_transaction_receipt(tx_hash)
+    except TransactionNotFound:
+        return None
+
+
+def _first_mined(w3: Web3, tx_hashes: list):
+    """(hash, receipt) of the first of several same-nonce txs found in a block, else (None, None)."""
+    for tx_hash in tx_hashes:
+        receipt = _receipt_if_mined(w3, tx_hash)
+        if receipt is not None:
+            return tx_hash, receipt
+    return None, None
+
+
+def _wait_for_receipt_ws(w3: Web3, tx_hash, ws_url: str, timeout: float):
+    """
+    Subscribe to newHeads over WebSocket and look for the receipt once per new block,
+    instead of polling on a timer.
+    """
+    import websockets  # installed with web3
+
+    async def _wait():
+        async with websockets.connect(ws_url) as ws:
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}))
+            reply = json.loads(await ws.recv())
+            if "result" not in reply:
+                raise ConnectionError(f"eth_subscribe failed: {reply.get('error')}")
+            while True:
+                # Check before the first head too: the tx may already be mined
+                receipt = _receipt_if_mined(w3, tx_hash)
+                if receipt is not None:
+                    return receipt
+                await ws.recv()
+
+    return asyncio.run(asyncio.wait_for(_wait(), timeout))
+
+
+def _wait_for_receipt(
+    w3: Web3,
+    tx_hash,
+    timeout: float = 180,
+    poll_latency: float = 2.0,
+    max_poll_latency: float = 5.0,
+    ws_url: Optional[str] = None,
+    verbose: bool = True,
+):
+    """
+    Wait for a transaction receipt. With ws_url, one receipt check per new block
+    (newHeads subscription); falls back to polling (noted if verbose) if the WebSocket
+    is unavailable.
+
+    Polling starts at poll_latency and backs off (x1.3, jittered) up to max_poll_latency:
+    Sepolia blocks are ~12s, so web3's default 0.1s poll only hammers the node.
+    """
+    if ws_url:
+        try:
+            return _wait_for_receipt_ws(w3, tx_hash, ws_url, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Transaction {tx_hash.hex()} not mined within {timeout}s")
+        except Exception as e:
+            if verbose:
+                print(f"  WebSocket wait unavailable ({e}); polling instead")
+    deadline = time.monotonic() + timeout
+    poll = poll_latency
+    while True:
+        receipt = _receipt_if_mined(w3, tx_hash)
+        if receipt is not None:
+            return receipt
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Transaction {tx_hash.hex()} not mined within {timeout}s")
+        time.sleep(poll * random.uniform(0.8, 1.2))
+        poll = min(poll * 1.3, max_poll_latency)
+
+
+# controller address -> (expires_at monotonic, min_commitment_age, max_commitment_age)
+_COMMITMENT_AGES: dict = {}
+
+
+def _commitment_age_calls() -> list:
+    data = [_calldata(SEL_MIN_COMMITMENT_AGE, [], []), _calldata(SEL_MAX_COMMITMENT_AGE, [], [])]
+    return [("eth_call", [{"to": ETH_REGISTRAR_CONTROLLER_CS, "data": d}, "latest"]) for d in data]
+
+
+def _cache_commitment_ages(raw_min: str, raw_max: str) -> tuple:
+    ages = (
+        decode(["uint256"], bytes.fromhex(raw_min[2:]))[0],
+        decode(["uint256"], bytes.fromhex(raw_max[2:]))[0],
+    )
+    _COMMITMENT_AGES[ETH_REGISTRAR_CONTROLLER_CS] = (time.monotonic() + COMMITMENT_AGE_TTL_SECONDS, *ages)
+    return ages
+
+
+def _cached_commitment_ages() -> Optional[tuple]:
+    cached = _COMMITMENT_AGES.get(ETH_REGISTRAR_CONTROLLER_CS)
+    if cached and cached[0] > time.monotonic():
+        return cached[1], cached[2]
+    return None
+
+
+def get_commitment_ages() -> tuple:
+    """(minCommitmentAge, maxCommitmentAge) in seconds, cached for COMMITMENT_AGE_TTL_SECONDS."""
+    ages = _cached_commitment_ages()
+    if ages is None:
+        ages = _cache_commitment_ages(*_rpc_batch(_commitment_age_calls()))
+    return ages
+
+
+def _eip1559_fees(fee_history: dict) -> dict:
+    """Fee fields from eth_feeHistory: maxFee = 2 * next base fee + median tip (50th percentile)."""
+    base_fee = int(fee_history["baseFeePerGas"][-1], 16)
+    tip = int(statistics.median(int(r[0], 16) for r in fee_history["reward"]))
+    return {
+        "type": 2,
+        "maxFeePerGas": 2 * base_fee + tip,
+        "maxPriorityFeePerGas": tip,
+    }
+
+
+def _pre_registration_reads(
+    domain_name: str,
+    owner_address: str,
+    duration_seconds: int,
+    commitment: bytes,
+) -> tuple:
+    """
+    Everything register_ens_domain needs from the chain before the commit tx, in one batched RPC.
+    Returns (chain_id, balance_wei, is_available, (base, premium), nonce, commit_gas, fees,
+    (min_commitment_age, max_commitment_age)), where nonce is for the commit tx (register uses nonce + 1) and fees
+    are the EIP-1559 tx fields used for both txs.
+    The commitment ages ride along in the batch only when the cache is cold.
+    """
+    def eth_call(data: str) -> tuple:
+        return ("eth_call", [{"to": ETH_REGISTRAR_CONTROLLER_CS, "data": data}, "latest"])
+
+    ages = _cached_commitment_ages()
+    raw = _rpc_batch([
+        ("eth_chainId", []),
+        ("eth_getBalance", [owner_address, "latest"]),
+        eth_call(_calldata(SEL_AVAILABLE, ["string"], [domain_name])),
+        eth_call(_calldata(SEL_RENT_PRICE, RENT_PRICE_TYPES, [domain_name, duration_seconds])),
+        ("eth_getTransactionCount", [owner_address, "pending"]),
+        ("eth_estimateGas", [{
+            "from": owner_address,
+            "to": ETH_REGISTRAR_CONTROLLER_CS,
+            "data": _calldata(SEL_COMMIT, ["bytes32"], [commitment]),
+        }]),
+        ("eth_feeHistory", [hex(5), "latest", [50]]),
+    ] + (_commitment_age_calls() if ages is None else []))
+    chain_id = int(raw[0], 16)
+    balance = int(raw[1], 16)
+    (is_available,) = decode(["bool"], bytes.fromhex(raw[2][2:]))
+    price = decode(["uint256", "uint256"], bytes.fromhex(raw[3][2:]))
+    nonce = int(raw[4], 16)
+    commit_gas = int(int(raw[5], 16) * GAS_ESTIMATE_BUFFER)
+    fees = _eip1559_fees(raw[6])
+    if ages is None:
+        ages = _cache_commitment_ages(raw[7], raw[8])
+    return chain_id, balance, is_available, price, nonce, commit_gas, fees, ages
+
+
 def register_ens_domain(
     domain_name: str,
     duration_seconds: int = 31536000,
-    set_reverse_record: bool = False
+    set_reverse_record: bool = False,
+    ws_url: Optional[str] = WS_RPC_URL,
+    verbose: bool = True
 ) -> dict:
     """
     Register an ENS domain on Sepolia testnet.
@@ -129,134 +425,243 @@ def register_ens_domain(
         domain_name: The domain name without .eth suffix
         duration_seconds: Registration duration in seconds (default 1 year)
         set_reverse_record: Whether to set the reverse record (default True)
+        ws_url: Optional WebSocket RPC; if set, receipts are awaited via newHeads
+            instead of HTTP polling (default: WS_RPC_URL env)
+        verbose: Print progress (default True); pass False when wrapping this in a service
     
     Returns:
         dict with transaction hashes and registration details
     """
     
-    # Initialize Web3
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    
-    if not w3.is_connected():
-        raise ConnectionError("Failed to connect to Sepolia RPC")
-    
-    print(f"✓ Connected to Sepolia (Chain ID: {w3.eth.chain_id})")
+    # Shared Web3 client
+    w3 = _get_w3()
     
     # Setup account
     account = w3.eth.account.from_key(PRIVATE_KEY)
     owner_address = account.address
-    print(f"✓ Using account: {owner_address}")
-    
-    # Check balance
-    balance = w3.eth.get_balance(owner_address)
-    print(f"✓ Account balance: {w3.from_wei(balance, 'ether')} ETH")
+    secret = secrets.token_bytes(32)
     
-    # Initialize controller contract
-    controller = w3.eth.contract(
-        address=Web3.to_checksum_address(ETH_REGISTRAR_CONTROLLER),
-        abi=CONTROLLER_ABI
+    # makeCommitment is a pure function: compute it locally instead of an eth_call
+    commitment = make_commitment(
+        domain_name,
+        owner_address,
+        duration_seconds,
+        secret,
+        PUBLIC_RESOLVER_CS,
+        [],  # Empty data array
+        set_reverse_record,
+        0  # ownerControlledFuses
     )
     
+    # All pre-commit reads (chain id, balance, availability, price, nonce, commit gas
+    # estimate, fee history, min commitment age) go out as one JSON-RPC batch.
+    (
+        chain_id,
+        balance,
+        is_available,
+        price,
+        nonce,
+        commit_gas,
+        fees,
+        (min_commitment_age, max_commitment_age),
+    ) = _pre_registration_reads(domain_name, owner_address, duration_seconds, commitment)
+    
+    if verbose:
+        print(f"✓ Connected to Sepolia (Chain ID: {chain_id})")
+        print(f"✓ Using account: {owner_address}")
+        print(f"✓ Account balance: {w3.from_wei(balance, 'ether')} ETH")
+    
+    controller = _get_controller()
+    
     # Step 1: Check availability
-    print(f"\n[1/5] Checking availability of '{domain_name}.eth'...")
-    is_available = controller.functions.available(domain_name).call()
+    if verbose:
+        print(f"\n[1/5] Checking availability of '{domain_name}.eth'...")
     
     if not is_available:
         raise ValueError(f"Domain '{domain_name}.eth' is not available")
-    print(f"✓ Domain '{domain_name}.eth' is available!")
+    if verbose:
+        print(f"✓ Domain '{domain_name}.eth' is available!")
     
     # Step 2: Get rent price
-    print(f"\n[2/5] Getting rent price...")
-    price = controller.functions.rentPrice(domain_name, duration_seconds).call()
     total_price = price[0] + price[1]  # base + premium
     total_price_with_buffer = int(total_price * 1.05)  # 5% buffer for price fluctuations
-    print(f"✓ Price: {w3.from_wei(total_price, 'ether')} ETH (+ 5% buffer)")
+    total_price_eth = w3.from_wei(total_price, 'ether')
+    if verbose:
+        print(f"\n[2/5] Getting rent price...")
+        print(f"✓ Price: {total_price_eth} ETH (+ 5% buffer)")
     
-    # Step 3: Generate secret and make commitment
-    print(f"\n[3/5] Creating commitment...")
-    secret = secrets.token_bytes(32)
-    
-    commitment = controller.functions.makeCommitment(
-        domain_name,
-        owner_address,
-        duration_seconds,
-        secret,
-        Web3.to_checksum_address(PUBLIC_RESOLVER),
-        [],  # Empty data array
-        set_reverse_record,
-        0  # ownerControlledFuses
-    ).call()
-    
-    print(f"✓ Commitment hash: {commitment.hex()}")
+    # Step 3: Commitment (secret generated and commitment computed above)
+    if verbose:
+        print(f"\n[3/5] Creating commitment...")
+        print(f"✓ Commitment hash: {commitment.hex()}")
     
     # Step 4: Submit commitment transaction
-    print(f"\n[4/5] Submitting commitment transaction...")
-    
-    # Get min commitment age
-    min_commitment_age = controller.functions.minCommitmentAge().call()
-    print(f"  Min commitment age: {min_commitment_age} seconds")
+    if verbose:
+        print(f"\n[4/5] Submitting commitment transaction...")
+        print(f"  Min commitment age: {min_commitment_age} seconds")
+        print(f"  Max commitment age: {max_commitment_age} seconds")
     
     commit_tx = controller.functions.commit(commitment).build_transaction({
         'from': owner_address,
-        'nonce': w3.eth.get_transaction_count(owner_address),
-        'gas': 100000,
-        'gasPrice': w3.eth.gas_price,
+        'nonce': nonce,
+        'gas': commit_gas,
+        'chainId': chain_id,
+        **fees,
     })
     
     signed_commit_tx = w3.eth.account.sign_transaction(commit_tx, PRIVATE_KEY)
+    # The commitment is timestamped by its block, never before we send it: a safe lower bound
+    commitment_expires_at = time.monotonic() + max_commitment_age
     commit_tx_hash = w3.eth.send_raw_transaction(signed_commit_tx.raw_transaction)
-    print(f"✓ Commit TX sent: {commit_tx_hash.hex()}")
+    if verbose:
+        print(f"✓ Commit TX sent: {commit_tx_hash.hex()}")
+        print("  Waiting for confirmation...")
     
     # Wait for commit transaction confirmation
-    print("  Waiting for confirmation...")
-    commit_receipt = w3.eth.wait_for_transaction_receipt(commit_tx_hash)
+    commit_receipt = _wait_for_receipt(w3, commit_tx_hash, timeout=180, poll_latency=2, ws_url=ws_url, verbose=verbose)
     
     if commit_receipt['status'] != 1:
         raise Exception("Commit transaction failed")
-    print(f"✓ Commit confirmed in block {commit_receipt['blockNumber']}")
+    if verbose:
+        print(f"✓ Commit confirmed in block {commit_receipt['blockNumber']}")
     
     # Wait for minimum commitment age + buffer
     wait_time = min_commitment_age + 5
-    print(f"\n  ⏳ Waiting {wait_time} seconds for commitment to mature...")
-    
-    for remaining in range(wait_time, 0, -1):
-        print(f"    {remaining} seconds remaining...", end='\r')
-        time.sleep(1)
-    print(f"    ✓ Commitment matured!              ")
+    if verbose:
+        print(f"\n  ⏳ Waiting {wait_time} seconds for commitment to mature...")
+        # Coarse 5s ticks: the wait is pure chain time, no need to wake every second
+        deadline = time.monotonic() + wait_time
+        remaining = wait_time
+        while remaining > 0:
+            print(f"    {int(remaining + 0.5)} seconds remaining...", end='\r', flush=True)
+            time.sleep(min(5, remaining))
+            remaining = deadline - time.monotonic()
+        print(f"    ✓ Commitment matured!              ")
+    else:
+        time.sleep(wait_time)
     
     # Step 5: Register the domain
-    print(f"\n[5/5] Registering domain...")
+    if verbose:
+        print(f"\n[5/5] Registering domain...")
     
-    register_tx = controller.functions.register(
+    register_fn = controller.functions.register(
         domain_name,
         owner_address,
         duration_seconds,
         secret,
-        Web3.to_checksum_address(PUBLIC_RESOLVER),
+        PUBLIC_RESOLVER_CS,
         [],  # Empty data array
         set_reverse_record,
         0  # ownerControlledFuses
-    ).build_transaction({
-        'from': owner_address,
-        'value': total_price_with_buffer,
-        'nonce': w3.eth.get_transaction_count(owner_address),
-        'gas': 300000,
-        'gasPrice': w3.eth.gas_price,
-    })
-    
-    signed_register_tx = w3.eth.account.sign_transaction(register_tx, PRIVATE_KEY)
-    register_tx_hash = w3.eth.send_raw_transaction(signed_register_tx.raw_transaction)
-    print(f"✓ Register TX sent: {register_tx_hash.hex()}")
-    
-    # Wait for register transaction confirmation
-    print("  Waiting for confirmation...")
-    register_receipt = w3.eth.wait_for_transaction_receipt(register_tx_hash)
+    )
+    # Estimate only now: register reverts until the commitment has matured
+    try:
+        register_gas = int(
+            register_fn.estimate_gas({'from': owner_address, 'value': total_price_with_buffer})
+            * GAS_ESTIMATE_BUFFER
+        )
+    except Exception:
+        register_gas = REGISTER_GAS_FALLBACK
+    # Retry with the same secret and commitment rather than starting over, as long as the
+    # commitment is younger than maxCommitmentAge (after that register can only revert). A register tx still pending after REGISTER_ATTEMPT_TIMEOUT is replaced at
+    # the same nonce with bumped fees. A reverted one is only retried if the rent price rose
+    # past what we sent (resending the same call would just revert again).
+    register_nonce = nonce + 1  # commit used nonce
+    register_fees = dict(fees)
+    pending_hashes = []  # register txs sent at register_nonce, any of which may be the one mined
+    register_tx_hash = None
+    register_receipt = None
+    bump_fees = False
+    commitment_expired = False
+    for attempt in range(REGISTER_ATTEMPTS):
+        if time.monotonic() >= commitment_expires_at:
+            commitment_expired = True
+            break
+        if bump_fees:
+            register_fees = {
+                **register_fees,
+                'maxFeePerGas': int(register_fees['maxFeePerGas'] * REGISTER_FEE_BUMP),
+                'maxPriorityFeePerGas': int(register_fees['maxPriorityFeePerGas'] * REGISTER_FEE_BUMP),
+            }
+            if verbose:
+                print(f"  Resending register TX ({attempt + 1}/{REGISTER_ATTEMPTS}) with fees x{REGISTER_FEE_BUMP}...")
+        register_tx = register_fn.build_transaction({
+            'from': owner_address,
+            'value': total_price_with_buffer,
+            'nonce': register_nonce,
+            'gas': register_gas,
+            'chainId': chain_id,
+            **register_fees,
+        })
+        
+        signed_register_tx = w3.eth.account.sign_transaction(register_tx, PRIVATE_KEY)
+        try:
+            sent_hash = w3.eth.send_raw_transaction(signed_register_tx.raw_transaction)
+        except Exception:
+            # "nonce too low": an earlier tx at this nonce was mined after we gave up on it
+            register_tx_hash, register_receipt = _first_mined(w3, pending_hashes)
+            if register_receipt is None:
+                raise
+            break
+        register_tx_hash = sent_hash
+        pending_hashes.append(register_tx_hash)
+        if verbose:
+            print(f"✓ Register TX sent: {register_tx_hash.hex()}")
+            print("  Waiting for confirmation...")
+        
+        # Wait for register transaction confirmation
+        try:
+            register_receipt = _wait_for_receipt(
+                w3, register_tx_hash, timeout=REGISTER_ATTEMPT_TIMEOUT, poll_latency=1, ws_url=ws_url, verbose=verbose
+            )
+        except TimeoutError:
+            # An earlier tx at this nonce may have been mined instead of the one we waited on
+            mined_hash, register_receipt = _first_mined(w3, pending_hashes)
+            if register_receipt is None:
+                bump_fees = True  # still pending: replace it at the same nonce
+                continue
+            register_tx_hash = mined_hash
+        if register_receipt['status'] == 1:
+            break
+        
+        # Reverted (its nonce is used up). Only a rent price rise is worth another attempt.
+        available_raw, price_raw = _rpc_batch([
+            ("eth_call", [{"to": ETH_REGISTRAR_CONTROLLER_CS, "data": _calldata(SEL_AVAILABLE, ["string"], [domain_name])}, "latest"]),
+            ("eth_call", [{
+                "to": ETH_REGISTRAR_CONTROLLER_CS,
+                "data": _calldata(SEL_RENT_PRICE, RENT_PRICE_TYPES, [domain_name, duration_seconds]),
+            }, "latest"]),
+        ])
+        if not decode(["bool"], bytes.fromhex(available_raw[2:]))[0]:
+            raise ValueError(f"Domain '{domain_name}.eth' was registered by someone else")
+        price = decode(["uint256", "uint256"], bytes.fromhex(price_raw[2:]))
+        if int((price[0] + price[1]) * 1.05) <= total_price_with_buffer:
+            break  # price did not move: the revert has another cause, retrying would revert again
+        total_price = price[0] + price[1]
+        total_price_with_buffer = int(total_price * 1.05)
+        total_price_eth = w3.from_wei(total_price, 'ether')
+        if verbose:
+            print(f"  Register TX reverted; rent price rose to {total_price_eth} ETH, retrying...")
+        register_nonce += 1
+        pending_hashes = []
+        bump_fees = False
     
-    if register_receipt['status'] != 1:
+    if register_receipt is None and pending_hashes:
+        # Last replacement timed out: one of the same-nonce txs may still have been mined
+        mined_hash, register_receipt = _first_mined(w3, pending_hashes)
+        if register_receipt is not None:
+            register_tx_hash = mined_hash
+    if register_receipt is None or register_receipt['status'] != 1:
+        if commitment_expired:
+            raise Exception(
+                f"Register transaction failed: commitment older than maxCommitmentAge "
+                f"({max_commitment_age}s), commit again"
+            )
         raise Exception("Register transaction failed")
     
-    print(f"✓ Registration confirmed in block {register_receipt['blockNumber']}")
-    print(f"\n🎉 Successfully registered '{domain_name}.eth'!")
+    if verbose:
+        print(f"✓ Registration confirmed in block {register_receipt['blockNumber']}")
+        print(f"\n🎉 Successfully registered '{domain_name}.eth'!")
     
     return {
         "domain": f"{domain_name}.eth",
@@ -265,36 +670,63 @@ def register_ens_domain(
         "commit_tx_hash": commit_tx_hash.hex(),
         "register_tx_hash": register_tx_hash.hex(),
         "total_cost_wei": total_price,
-        "total_cost_eth": float(w3.from_wei(total_price, 'ether'))
+        "total_cost_eth": float(total_price_eth)
     }
 
 
 def check_domain_availability(domain_name: str) -> bool:
     """Quick check if a domain is available."""
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    controller = w3.eth.contract(
-        address=Web3.to_checksum_address(ETH_REGISTRAR_CONTROLLER),
-        abi=CONTROLLER_ABI
-    )
-    return controller.functions.available(domain_name).call()
+    return _controller_call(SEL_AVAILABLE, ["string"], [domain_name], ["bool"])[0]
 
 
 def get_registration_price(domain_name: str, duration_seconds: int = 31536000) -> dict:
     """Get the price to register a domain."""
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    controller = w3.eth.contract(
-        address=Web3.to_checksum_address(ETH_REGISTRAR_CONTROLLER),
-        abi=CONTROLLER_ABI
-    )
-    price = controller.functions.rentPrice(domain_name, duration_seconds).call()
+    price = _controller_call(SEL_RENT_PRICE, RENT_PRICE_TYPES, [domain_name, duration_seconds], ["uint256", "uint256"])
     return {
         "base_wei": price[0],
         "premium_wei": price[1],
         "total_wei": price[0] + price[1],
-        "total_eth": float(w3.from_wei(price[0] + price[1], 'ether'))
+        "total_eth": float(Web3.from_wei(price[0] + price[1], 'ether'))
     }
 
 
+def check_many_availability(domain_names: list) -> dict:
+    """Availability of several domains in one batched RPC round-trip. Returns {name: bool}."""
+    if not domain_names:
+        return {}  # an empty JSON-RPC batch is rejected by the node
+    raw = _rpc_batch([
+        ("eth_call", [{"to": ETH_REGISTRAR_CONTROLLER_CS, "data": _calldata(SEL_AVAILABLE, ["string"], [name])}, "latest"])
+        for name in domain_names
+    ])
+    return {
+        name: decode(["bool"], bytes.fromhex(r[2:]))[0]
+        for name, r in zip(domain_names, raw)
+    }
+
+
+def get_many_prices(domain_names: list, duration_seconds: int = 31536000) -> dict:
+    """Registration prices for several domains in one batched RPC round-trip. Returns {name: price dict}."""
+    if not domain_names:
+        return {}  # an empty JSON-RPC batch is rejected by the node
+    raw = _rpc_batch([
+        ("eth_call", [{
+            "to": ETH_REGISTRAR_CONTROLLER_CS,
+            "data": _calldata(SEL_RENT_PRICE, RENT_PRICE_TYPES, [name, duration_seconds]),
+        }, "latest"])
+        for name in domain_names
+    ])
+    prices = {}
+    for name, r in zip(domain_names, raw):
+        base, premium = decode(["uint256", "uint256"], bytes.fromhex(r[2:]))
+        prices[name] = {
+            "base_wei": base,
+            "premium_wei": premium,
+            "total_wei": base + premium,
+            "total_eth": float(Web3.from_wei(base + premium, 'ether'))
+        }
+    return prices
+
+
 if __name__ == "__main__":
     try:
         result = register_ens_domain(
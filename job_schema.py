@@ -5,6 +5,8 @@ Define the minimal job structure
 from typing import Dict, Any
 
 class Job:
+    __slots__ = ("job_id", "requester_ens", "task_type", "input_data", "price_usdc", "payment_signature")
+
     def __init__(self, job_id: str, requester_ens: str, task_type: str, input_data: Dict[str, Any], price_usdc: float = 0.01):
         self.job_id = job_id
         self.requester_ens = requester_ens  # Use ENS instead of just a name
@@ -20,4 +22,4 @@ class Job:
             "task_type": self.task_type,
             "price": self.price_usdc,
             "payment_signature": self.payment_signature
-        }
\ No newline at end of file
+        }
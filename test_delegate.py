@@ -1,34 +1,38 @@
 # test_delegate.py
-import time
-from queue import Queue
+import asyncio
 from job_schema import Job
 
-# Shared queue
-job_queue = Queue()
+NUM_WORKERS = 2
 
 # Worker function
-def execute_job(job: Job):
+async def execute_job(job: Job):
     print(f"Worker received job: {job.task_type}")
-    time.sleep(1)
-    print(f"Worker finished job: {job.task_type} for {job.requester}\n")
+    await asyncio.sleep(1)
+    print(f"Worker finished job: {job.task_type} for {job.requester_ens}\n")
 
-def worker_loop():
+async def worker_loop(job_queue: asyncio.Queue):
     while not job_queue.empty():
-        job = job_queue.get()
-        execute_job(job)
+        job = job_queue.get_nowait()
+        await execute_job(job)
         job_queue.task_done()
 
-# Client creates jobs
-jobs = [
-    Job(job_id="job_001", requester="agent_a", task_type="analyze-data", input_data={"dataset": "data1.csv"}),
-    Job(job_id="job_002", requester="agent_a", task_type="summarize-report", input_data={"report": "report.docx"}),
-]
+async def main():
+    # Shared queue
+    job_queue = asyncio.Queue()
 
-for job in jobs:
-    print(f"Client: Sending job {job.job_id} - {job.task_type}")
-    job_queue.put(job)
+    # Client creates jobs
+    jobs = [
+        Job(job_id="job_001", requester_ens="agent_a", task_type="analyze-data", input_data={"dataset": "data1.csv"}),
+        Job(job_id="job_002", requester_ens="agent_a", task_type="summarize-report", input_data={"report": "report.docx"}),
+    ]
 
-print("\nClient: All jobs sent!\n")
+    for job in jobs:
+        print(f"Client: Sending job {job.job_id} - {job.task_type}")
+        job_queue.put_nowait(job)
 
-# Start worker loop
-worker_loop()
+    print("\nClient: All jobs sent!\n")
+
+    # Start workers
+    await asyncio.gather(*[worker_loop(job_queue) for _ in range(NUM_WORKERS)])
+
+asyncio.run(main())
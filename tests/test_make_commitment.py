@@ -0,0 +1,46 @@
+"""make_commitment must hash exactly what the Sepolia controller's makeCommitment does."""
+
+import os
+
+import pytest
+from web3 import Web3
+
+os.environ.setdefault("PRIVATE_KEY", "0x" + "11" * 32)
+os.environ.setdefault("AGENTPAY_ENS_NAME", "cuttlefish")
+
+import ens_register_only  # noqa: E402  (needs the env above at import)
+
+OWNER = "0x5B38Da6a701c568545dCfcB03FcB875f56beddC4"
+RESOLVER = "0x8FADE66B79cC9f707aB26799354482EB93a5B7dD"  # Sepolia public resolver
+SECRET = b"\x42" * 32
+DURATION = 31536000
+
+# (name, data, reverse_record) -> expected commitment. Computed from the controller source,
+# keccak256(abi.encode(keccak256(name), owner, duration, secret, resolver, data, reverseRecord,
+# ownerControlledFuses)), with the ABI words laid out by hand rather than through eth_abi.
+VECTORS = [
+    ("cuttlefish", [], False, "40bfbb0e4fd7dc19c28e36ec0cb5d0f432d36e0291a4a1b30ca8105e640fc5bd"),
+    ("cuttlefish", [bytes.fromhex("1234")], True, "cd2b49dfbc7e049842b3dcb5c2b29f3b63ef8bededb409433742bcd667e523d5"),
+]
+
+SEL_MAKE_COMMITMENT = Web3.keccak(text="makeCommitment(string,address,uint256,bytes32,address,bytes[],bool,uint16)")[:4]
+
+
+@pytest.mark.parametrize("name,data,reverse_record,expected", VECTORS)
+def test_make_commitment_fixed_vector(name, data, reverse_record, expected):
+    commitment = ens_register_only.make_commitment(
+        name, OWNER, DURATION, SECRET, RESOLVER, data, reverse_record
+    )
+    assert commitment.hex() == expected
+
+
+@pytest.mark.skipif(not os.environ.get("ENS_LIVE_TESTS"), reason="set ENS_LIVE_TESTS=1 to query the Sepolia controller")
+@pytest.mark.parametrize("name,data,reverse_record,expected", VECTORS)
+def test_make_commitment_matches_controller(name, data, reverse_record, expected):
+    (onchain,) = ens_register_only._controller_call(
+        SEL_MAKE_COMMITMENT,
+        ["string", "address", "uint256", "bytes32", "address", "bytes[]", "bool", "uint16"],
+        [name, OWNER, DURATION, SECRET, RESOLVER, data, reverse_record, 0],
+        ["bytes32"],
+    )
+    assert onchain.hex() == expected
@@ -0,0 +1,77 @@
+"""The demo agents must not react to their own posts echoed back by the feed."""
+
+from autonomous_adapter import demo_config, feed_client
+from autonomous_adapter.demo_config import build_demo_config, format_offer_text
+from autonomous_adapter.watch_moltbook import watch_moltbook_feed
+
+
+def _dispatched(config, items):
+    seen = {"offer": [], "accept": []}
+    watch_moltbook_feed(
+        on_offer=seen["offer"].append,
+        on_accept=seen["accept"].append,
+        poll_interval_seconds=0,
+        feed_provider=lambda: items,
+        should_stop=lambda: True,
+        self_ens=config["self_ens"],
+        self_kinds=config["self_kinds"],
+    )
+    return seen
+
+
+def _client_config(monkeypatch, my_ens):
+    posted = []
+
+    def fake_post_offer(text, full_text=None):
+        posted.append(text)
+        return {"id": "offer-1"}
+
+    monkeypatch.setattr(feed_client, "post_offer", fake_post_offer)
+    monkeypatch.setattr(demo_config, "_ens_from_env_file", lambda: "")
+    monkeypatch.delenv("AGENTPAY_ENS_NAME", raising=False)
+    config = build_demo_config("client", my_ens=my_ens, initial_offer={"task_type": "summarize"})
+    return config, posted
+
+
+def test_client_skips_its_own_offer(monkeypatch):
+    # "client" used to be mangled to "clien.eth" by rstrip(".eth")
+    config, posted = _client_config(monkeypatch, "client")
+    assert config["self_ens"] == "client.eth"
+    seen = _dispatched(config, [{"id": "offer-1", "text": posted[0]}])
+    assert seen == {"offer": [], "accept": []}
+
+
+def test_client_without_ens_skips_default_offer(monkeypatch):
+    config, posted = _client_config(monkeypatch, "")
+    assert "ens: client.eth" in posted[0]
+    seen = _dispatched(config, [{"id": "offer-1", "text": posted[0]}])
+    assert seen == {"offer": [], "accept": []}
+
+
+def test_client_still_sees_other_offers(monkeypatch):
+    config, _ = _client_config(monkeypatch, "client")
+    other = format_offer_text("summarize", poster_ens="someone.eth")
+    seen = _dispatched(config, [{"id": "offer-2", "text": other}])
+    assert len(seen["offer"]) == 1
+
+
+def test_worker_skips_its_own_accept(monkeypatch):
+    monkeypatch.setattr(demo_config, "_ens_from_env_file", lambda: "")
+    config = build_demo_config("worker", my_ens="worker.eth")
+    assert config["self_ens"] == "worker.eth"
+    seen = _dispatched(config, [{"id": "r1", "thread_id": "offer-1", "text": "[AGENTPAY_ACCEPT]\nens: worker.eth"}])
+    assert seen == {"offer": [], "accept": []}
+
+
+def test_shared_ens_worker_sees_client_offer(monkeypatch):
+    # Demo: worker and client read the same AGENTPAY_ENS_NAME from one .env
+    config, posted = _client_config(monkeypatch, "shared")
+    worker = build_demo_config("worker", my_ens="shared")
+    seen = _dispatched(worker, [{"id": "offer-1", "text": posted[0]}])
+    assert len(seen["offer"]) == 1
+
+
+def test_shared_ens_client_sees_worker_accept(monkeypatch):
+    config, _ = _client_config(monkeypatch, "shared")
+    seen = _dispatched(config, [{"id": "r1", "thread_id": "offer-1", "text": "[AGENTPAY_ACCEPT]\nens: shared.eth"}])
+    assert len(seen["accept"]) == 1
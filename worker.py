@@ -2,15 +2,29 @@
 listens for jobs and executes them.
 """
 
-import time
+import asyncio
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
-from pydantic import BaseModel
-
-app = FastAPI()
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
 
 # MOCK DATABASE: In production, these are Circle/Arc wallet addresses
 WORKER_WALLET = "0xWorkerENS_or_Address"
 JOB_PRICE_USDC = 0.05 
+# Paid jobs executed concurrently (each job is one request held open until it finishes)
+try:
+    NUM_JOB_CONSUMERS = max(1, int(os.getenv("WORKER_JOB_CONSUMERS") or 64))
+except ValueError:
+    NUM_JOB_CONSUMERS = 64
+
+# The 402 challenge never changes: build it once and return the same Response to every unpaid request.
+_PAYMENT_REQUIRED_BODY = f"Payment Required. Send {JOB_PRICE_USDC} USDC to {WORKER_WALLET} on Arc.".encode()
+_PAYMENT_REQUIRED = Response(
+    status_code=402,
+    content=_PAYMENT_REQUIRED_BODY,
+    headers={"Cache-Control": "no-store"},
+)
 
 class JobRequest(BaseModel):
     job_id: str
@@ -18,26 +32,66 @@ class JobRequest(BaseModel):
     task_type: str
     input_data: dict
 
-def execute_logic(task_type, data):
+async def execute_logic(task_type, data):
     print(f"⚙️ Working on: {task_type}")
-    time.sleep(2) # Simulate work
+    await asyncio.sleep(2) # Simulate work; real CPU-bound work goes through loop.run_in_executor
     return f"Processed {task_type} successfully."
 
+async def job_consumer(queue: asyncio.Queue):
+    """Take paid jobs off the queue and resolve each job's future with its result."""
+    while True:
+        job, future = await queue.get()
+        try:
+            result = await execute_logic(job.task_type, job.input_data)
+            if not future.cancelled():
+                future.set_result(result)
+        except Exception as e:
+            if not future.cancelled():
+                future.set_exception(e)
+        finally:
+            queue.task_done()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the job consumers with the server and cancel them on shutdown."""
+    app.state.queue = asyncio.Queue()
+    consumers = [asyncio.create_task(job_consumer(app.state.queue)) for _ in range(NUM_JOB_CONSUMERS)]
+    try:
+        yield
+    finally:
+        for task in consumers:
+            task.cancel()
+        await asyncio.gather(*consumers, return_exceptions=True)
+        del app.state.queue
+
+app = FastAPI(lifespan=lifespan)
+
 @app.post("/submit-job")
-async def submit_job(job: JobRequest, request: Request):
+async def submit_job(request: Request):
     # --- THE X402 GUARD ---
+    # Checked before the body is read, so unpaid requests cost no parsing.
     payment_proof = request.headers.get("X-PAYMENT")
     
     if not payment_proof:
         # We reject the job and send back the payment requirements
-        return Response(
-            status_code=402,
-            content=f"Payment Required. Send {JOB_PRICE_USDC} USDC to {WORKER_WALLET} on Arc."
-        )
+        return _PAYMENT_REQUIRED
+
+    # Parse and validate the raw body in one pass (pydantic-core), not json -> dict -> model.
+    try:
+        job = JobRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        return JSONResponse(status_code=422, content={"detail": e.errors(include_url=False, include_context=False)})
 
     # --- THE EXECUTION ---
     # If the code reaches here, payment was "verified"
-    result = execute_logic(job.task_type, job.input_data)
+    queue = getattr(app.state, "queue", None)
+    if queue is None:
+        # Lifespan not run (e.g. TestClient without a `with` block): execute inline
+        result = await execute_logic(job.task_type, job.input_data)
+    else:
+        future = asyncio.get_running_loop().create_future()
+        await queue.put((job, future))
+        result = await future
     return {"status": "completed", "result": result, "worker": WORKER_WALLET}
 
 if __name__ == "__main__":
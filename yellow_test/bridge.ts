@@ -6,15 +6,20 @@
  * Usage from Python:
  *   result = subprocess.run(['tsx', 'bridge.ts'], input=json.dumps({...}), capture_output=True, text=True)
  *   response = json.loads(result.stdout)
+ *
+ * Long-lived mode (`tsx bridge.ts --serve`): one JSON request per line on stdin, one JSON
+ * response per line on stdout, until stdin closes. Lets callers pay Node/tsx startup once.
  * 
  * Commands:
  *   - test: Simple ping/pong to verify bridge works
  *   - create_session: Create app session (client + worker). Use quorum: 2 for two-party escrow.
  *   - submit_state, sign_state_worker, close_session: App session escrow (steps 5a–5f).
  *   - pay_via_channel: Channel path (4a+4c+4d) — create channel if needed, transfer to worker, close channel. Returns close_tx_hash (on-chain, Sepolia Etherscan).
+ *   - batch: Run several of the above in order in one call ({ ops: [...] } -> { results: [...] }).
  */
 
 import "dotenv/config";
+import { createInterface } from "node:readline";
 import WebSocket from "ws";
 import { createWalletClient, createPublicClient, http } from "viem";
 import { sepolia } from "viem/chains";
@@ -1817,6 +1822,106 @@ async function handlePayViaChannel(request: BridgeRequest): Promise<BridgeRespon
   }
 }
 
+/**
+ * Run several requests in order in one bridge call (one round trip from Python).
+ * Ops run sequentially; the first failed op stops the batch.
+ * An op with version_from_previous: true takes `version` from the previous op's result
+ * (submit_state -> sign_state_worker).
+ *
+ * Request: { command: "batch", ops: [{ command: "submit_state", ... }, { command: "sign_state_worker", version_from_previous: true, ... }] }
+ * Response: { success: true, data: { results: [{ success, data?, error? }, ...] } }
+ */
+async function handleBatch(request: BridgeRequest): Promise<BridgeResponse> {
+  const ops = request.ops;
+  if (!Array.isArray(ops)) {
+    return {
+      success: false,
+      error: "Missing required field: ops (array of requests)",
+    };
+  }
+
+  const results: BridgeResponse[] = [];
+  for (const op of ops as BridgeRequest[]) {
+    let opRequest = op;
+    const previous = results[results.length - 1];
+    if (op.version_from_previous && previous) {
+      opRequest = { ...op, version: (previous.data as { version?: unknown } | undefined)?.version };
+    }
+    const result: BridgeResponse =
+      op.command === "batch"
+        ? { success: false, error: "Nested batch is not supported" }
+        : await dispatch(opRequest);
+    results.push(result);
+    if (!result.success) {
+      break;
+    }
+  }
+
+  return {
+    success: results.length === ops.length && results.every((r) => r.success),
+    data: { results },
+  };
+}
+
+/**
+ * Run one bridge request.
+ */
+async function dispatch(request: BridgeRequest): Promise<BridgeResponse> {
+  switch (request.command) {
+    case "test":
+      return handleTest();
+    case "steps_1_to_3":
+      return handleSteps1To3(request);
+    case "create_channel":
+      return handleCreateChannel(request);
+    case "channel_transfer":
+      return handleChannelTransfer(request);
+    case "close_channel":
+      return handleCloseChannel(request);
+    case "create_session":
+      return handleCreateSession(request);
+    case "submit_state":
+      return handleSubmitState(request);
+    case "sign_state_worker":
+      return handleSignStateWorker(request);
+    case "close_session":
+      return handleCloseSession(request);
+    case "pay_via_channel":
+      return handlePayViaChannel(request);
+    case "batch":
+      return handleBatch(request);
+    default:
+      return {
+        success: false,
+        error: `Unknown command: ${request.command}`,
+      };
+  }
+}
+
+/**
+ * Long-lived mode: one JSON request per stdin line, one JSON response per stdout line.
+ */
+async function serve() {
+  const lines = createInterface({ input: process.stdin, crlfDelay: Infinity });
+  for await (const line of lines) {
+    if (!line.trim()) {
+      continue;
+    }
+    let response: BridgeResponse;
+    try {
+      response = await dispatch(JSON.parse(line) as BridgeRequest);
+    } catch (error) {
+      response = {
+        success: false,
+        error: error instanceof Error ? error.message : String(error),
+      };
+    }
+    process.stdout.write(JSON.stringify(response) + "\n");
+  }
+  // stdin closed: caller is done. Exit even if a handler left a socket or timer behind.
+  process.exit(0);
+}
+
 /**
  * Main entry point: read JSON from stdin, execute command, write JSON to stdout.
  */
@@ -1839,45 +1944,7 @@ async function main() {
 
     const request: BridgeRequest = JSON.parse(input);
 
-    let response: BridgeResponse;
-
-    switch (request.command) {
-      case "test":
-        response = handleTest();
-        break;
-      case "steps_1_to_3":
-        response = await handleSteps1To3(request);
-        break;
-      case "create_channel":
-        response = await handleCreateChannel(request);
-        break;
-      case "channel_transfer":
-        response = await handleChannelTransfer(request);
-        break;
-      case "close_channel":
-        response = await handleCloseChannel(request);
-        break;
-      case "create_session":
-        response = await handleCreateSession(request);
-        break;
-      case "submit_state":
-        response = await handleSubmitState(request);
-        break;
-      case "sign_state_worker":
-        response = await handleSignStateWorker(request);
-        break;
-      case "close_session":
-        response = await handleCloseSession(request);
-        break;
-      case "pay_via_channel":
-        response = await handlePayViaChannel(request);
-        break;
-      default:
-        response = {
-          success: false,
-          error: `Unknown command: ${request.command}`,
-        };
-    }
+    const response = await dispatch(request);
 
     // Write JSON response to stdout
     console.log(JSON.stringify(response));
@@ -1891,7 +1958,7 @@ async function main() {
   }
 }
 
-main().catch((error) => {
+(process.argv.includes("--serve") ? serve() : main()).catch((error) => {
   const response: BridgeResponse = {
     success: false,
     error: error instanceof Error ? error.message : String(error),
@@ -2,61 +2,391 @@
 """
 Test script to verify the Python ↔ TS bridge works.
 Run: python3 test_bridge.py [test|create_session]
+
+Env: BRIDGE_VERBOSE=1 prints full response JSON on success too; BRIDGE_DEBUG=1 also
+shows the bridge's stderr.
 """
 
+import atexit
+import contextlib
+import io
 import json
 import os
+import re
+import shutil
+import signal
 import subprocess
 import sys
+import threading
+import types
 from pathlib import Path
 
+try:
+    import orjson
+    _dumps = orjson.dumps  # -> bytes
+    _loads = orjson.loads
+except ImportError:
+    # orjson is optional: stdlib json, encoded straight to bytes for the pipe
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+    _loads = json.loads
+
+# The 'test' request never changes: encode it once
+_TEST_REQ = {"command": "test"}
+_TEST_BYTES = _dumps(_TEST_REQ) + b"\n"
+
+# One encoder for every indented print, instead of json.dumps(..., indent=2) building one per call
+_PRETTY = json.JSONEncoder(indent=2).encode
+
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
 BRIDGE_TS = SCRIPT_DIR / "bridge.ts"
+BRIDGE_JS = SCRIPT_DIR / "bridge.js"  # esbuild output, see build_bridge()
+ESBUILD = SCRIPT_DIR / "node_modules" / ".bin" / "esbuild"  # installed with tsx
+BRIDGE_DEBUG = os.environ.get("BRIDGE_DEBUG") == "1"  # show bridge (Node) stderr
+# Print full response JSON on success too (it is always printed on failure)
+VERBOSE = BRIDGE_DEBUG or os.environ.get("BRIDGE_VERBOSE") == "1"
+_BRIDGE_STDERR = None if BRIDGE_DEBUG else subprocess.DEVNULL
+_BUILD_FAILED_MTIME = None  # bridge.ts mtime whose build failed: don't retry it on every spawn
 ENV_FILE = SCRIPT_DIR / ".env"
+# KEY=value per line; skips blank lines and # comments, trims whitespace around key and value.
+_ENV_RE = re.compile(rb"(?m)^[ \t]*([^=\s#]+)[ \t]*=[ \t]*(.*?)[ \t\r]*$")
+_ENV_CACHE = {"mtime": None, "data": None}  # parsed .env, reused until the file changes
+# Everything this script reads from .env; if all are already set (e.g. CI), .env is skipped
+ENV_KEYS = ("PRIVATE_KEY", "WORKER_ADDRESS", "WORKER_PRIVATE_KEY", "CLIENT_ADDRESS")
+
+
+def _find_tsx() -> list:
+    """tsx without the npx wrapper: local node_modules/.bin, then PATH, npx only as a last resort."""
+    local = SCRIPT_DIR / "node_modules" / ".bin" / "tsx"
+    if local.exists():
+        return [str(local)]
+    on_path = shutil.which("tsx")
+    if on_path:
+        return [on_path]
+    return ["npx", "tsx"]
+
+
+TSX = _find_tsx()
 
 
 def load_env():
-    """Load .env file if it exists."""
-    if ENV_FILE.exists():
-        with open(ENV_FILE) as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith("#") and "=" in line:
-                    key, value = line.split("=", 1)
-                    os.environ[key.strip()] = value.strip()
-
-
-def call_bridge(request: dict, timeout: int = 30) -> dict:
-    """Call the bridge and return parsed response."""
-    result = subprocess.run(
-        ["npx", "tsx", str(BRIDGE_TS)],
-        input=json.dumps(request),
-        capture_output=True,
-        text=True,
-        cwd=SCRIPT_DIR,
-        check=True,
-        timeout=timeout
+    """Load .env file if it exists (skipped when all ENV_KEYS are already in the environment)."""
+    if all(key in os.environ for key in ENV_KEYS):
+        refresh_creds()
+        return
+    try:
+        mtime = ENV_FILE.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None:
+        if _ENV_CACHE["mtime"] != mtime:
+            data = ENV_FILE.read_bytes()
+            _ENV_CACHE["data"] = {m[1].decode(): m[2].decode() for m in _ENV_RE.finditer(data)}
+            _ENV_CACHE["mtime"] = mtime
+        os.environ.update(_ENV_CACHE["data"])
+    refresh_creds()
+
+
+def refresh_creds():
+    """Re-read credentials from the environment into CREDS (load_env does this; call it after changing env)."""
+    global CREDS
+    CREDS = types.SimpleNamespace(
+        private_key=os.environ.get("PRIVATE_KEY"),
+        worker_address=os.environ.get("WORKER_ADDRESS"),
+        worker_private_key=os.environ.get("WORKER_PRIVATE_KEY"),
+        client_address=os.environ.get("CLIENT_ADDRESS"),  # Address for PRIVATE_KEY (client)
     )
-    
-    if result.stderr:
-        print(f"Bridge stderr: {result.stderr}")
-    
-    return json.loads(result.stdout)
 
 
-def test_bridge():
+refresh_creds()
+
+
+class Reporter:
+    """
+    Buffers everything printed inside the block and writes it to the real stdout in one
+    write: just before each bridge call blocks (so progress still shows ahead of every
+    wait) and on exit, including when the block raises or calls sys.exit.
+    """
+
+    _active = None
+
+    def __enter__(self):
+        self._stream = sys.stdout
+        self._buf = io.StringIO()
+        self._redirect = contextlib.redirect_stdout(self._buf)
+        self._redirect.__enter__()
+        Reporter._active = self
+        return self
+
+    def flush(self):
+        data = self._buf.getvalue()
+        if data:
+            self._stream.write(data)
+            self._stream.flush()
+            self._buf.seek(0)
+            self._buf.truncate()
+
+    def __exit__(self, *exc):
+        Reporter._active = None
+        self._redirect.__exit__(*exc)
+        self.flush()
+        return False
+
+
+def _flush_report():
+    if Reporter._active is not None:
+        Reporter._active.flush()
+
+
+def _kill_tree(proc, sig=getattr(signal, "SIGKILL", signal.SIGTERM)):
+    """
+    Signal the bridge and everything it spawned (npx -> tsx -> node). Bridges start in their
+    own session, so their process group id is their pid.
+    """
+    if not hasattr(os, "killpg"):  # Windows: no process groups to signal
+        proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def build_bridge() -> bool:
+    """
+    Compile bridge.ts to bridge.js with esbuild if it is missing or older than bridge.ts,
+    so calls run plain `node` instead of transforming TypeScript on every start.
+    Returns False (caller falls back to tsx) if esbuild is unavailable or fails; a failed
+    build is not retried until bridge.ts changes.
+    """
+    global _BUILD_FAILED_MTIME
+    ts_mtime = BRIDGE_TS.stat().st_mtime_ns
+    if BRIDGE_JS.exists() and BRIDGE_JS.stat().st_mtime_ns >= ts_mtime:
+        return True
+    if _BUILD_FAILED_MTIME == ts_mtime:
+        return False
+    esbuild = str(ESBUILD) if ESBUILD.exists() else shutil.which("esbuild") or str(ESBUILD)
+    try:
+        subprocess.run(
+            [
+                esbuild, str(BRIDGE_TS),
+                "--bundle", "--platform=node", "--format=esm", "--packages=external",
+                f"--outfile={BRIDGE_JS}",
+            ],
+            capture_output=True,
+            text=True,
+            cwd=SCRIPT_DIR,
+            check=True,
+            timeout=60,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"⚠️  Could not build bridge.js, using tsx: {e}")
+        _BUILD_FAILED_MTIME = ts_mtime
+        return False
+    return True
+
+
+def _bridge_command() -> list:
+    if build_bridge():
+        return ["node", str(BRIDGE_JS)]
+    return TSX + [str(BRIDGE_TS)]
+
+
+class BridgeClient:
+    """
+    Long-lived bridge process (`bridge.js --serve`): one JSON request per line in,
+    one JSON response per line out. Node/tsx start once instead of once per call.
+    Bridge stderr is discarded unless BRIDGE_DEBUG=1.
+    """
+
+    def __init__(self):
+        self._spawn()
+        # One request/response pair on the pipe at a time: responses carry no id to match on.
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _spawn(self):
+        self.proc = subprocess.Popen(
+            _bridge_command() + ["--serve"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=_BRIDGE_STDERR,
+            cwd=SCRIPT_DIR,
+            start_new_session=True,
+        )
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def restart(self):
+        """Replace the bridge process (e.g. killed by a timeout) with a fresh one."""
+        self.close()
+        self._spawn()
+
+    def call(self, request: dict, timeout: int = 30) -> dict:
+        return self.call_raw(_dumps(request) + b"\n", timeout)
+
+    def call_raw(self, payload: bytes, timeout: int = 30) -> dict:
+        """Send one already-encoded request line (JSON + b"\\n") and return the parsed response."""
+        timed_out = threading.Event()
+
+        def _kill():
+            timed_out.set()
+            _kill_tree(self.proc)
+
+        with self._lock:
+            if not self.alive():
+                self.restart()  # a timed-out or crashed call took the last process down
+            timer = threading.Timer(timeout, _kill)
+            timer.start()
+            try:
+                self.proc.stdin.write(payload)
+                self.proc.stdin.flush()
+                line = self.proc.stdout.readline()
+            finally:
+                timer.cancel()
+        if timed_out.is_set():
+            self.proc.wait()
+            raise subprocess.TimeoutExpired(self.proc.args, timeout)
+        if not line:
+            raise RuntimeError(f"Bridge exited (code {self.proc.poll()}); set BRIDGE_DEBUG=1 to see its stderr")
+        return _loads(line)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        if not self.alive():
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            _kill_tree(self.proc, signal.SIGTERM)
+
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def call_bridge_raw(payload: bytes, timeout: int = 30, bridge: BridgeClient = None) -> dict:
+    """call_bridge for a request already encoded as one JSON line (see _TEST_BYTES)."""
+    _flush_report()
+    return (bridge or _get_bridge()).call_raw(payload, timeout)
+
+
+def _get_bridge() -> BridgeClient:
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None or not _bridge.alive():
+            _bridge = BridgeClient()
+        return _bridge
+
+
+def call_bridge(request: dict, timeout: int = 30, bridge: BridgeClient = None) -> dict:
+    """Call the bridge and return parsed response (through `bridge` if given, else the shared one)."""
+    _flush_report()
+    return (bridge or _get_bridge()).call(request, timeout)
+
+
+def _checked_call(name: str, request: dict, bridge: BridgeClient = None, timeout: int = 35):
+    """call_bridge for run_all: returns (name, response or None, error message or None)."""
+    try:
+        response = call_bridge(request, timeout, bridge)
+    except Exception as e:
+        return name, None, f"{name} ERROR: {e}"
+    if not response.get("success"):
+        return name, response, f"{name} FAILED: {response.get('error')}"
+    return name, response, None
+
+
+def run_all(bridge: BridgeClient = None):
+    """
+    All bridge tests through one bridge process (`bridge`, else the shared one): the test
+    command, create_session, then submit_state and close_session on that same session.
+    """
+    client_key = CREDS.private_key
+    worker_address = CREDS.worker_address
+
+    print("\n[1/4] Testing 'test' command...")
+    results = [_checked_call("test", {"command": "test"}, bridge, timeout=10)]
+    if client_key and worker_address:
+        print("\n[2/4] Testing 'create_session'...")
+        results.append(_checked_call("create_session", {
+            "command": "create_session",
+            "client_private_key": client_key,
+            "worker_address": worker_address,
+            "quorum": 1,
+        }, bridge))
+    else:
+        print("⚠️  Skipping session tests: set PRIVATE_KEY and WORKER_ADDRESS in .env")
+    for _, _, error in results:
+        if error:
+            print(f"❌ {error}")
+
+    test1 = results[0][2] is None
+    print("✅ Test command PASSED!" if test1 else "❌ Test command FAILED")
+    session_id = close_error = None
+    if len(results) > 1 and results[1][2] is None:
+        session_id = results[1][1].get("data", {}).get("app_session_id")
+    success = session_id is not None
+    if success:
+        print(f"✅ Create session PASSED! Session ID: {session_id}")
+
+        # Reuse the session: submit state first, then close it.
+        print("\n[3/4] Testing 'submit_state' (known to have issues)...")
+        _, response, error = _checked_call("submit_state", {
+            "command": "submit_state",
+            "app_session_id": session_id,
+            "client_private_key": client_key,
+            "worker_address": worker_address,
+            "amount": "1000000",
+        }, bridge)
+        if error:
+            print(f"❌ {error}")
+        else:
+            print(f"✅ Submit state PASSED! Version: {response['data'].get('version', 'N/A')}")
+
+        print("\n[4/4] Testing 'close_session'...")
+        _, _, close_error = _checked_call("close_session", {
+            "command": "close_session",
+            "app_session_id": session_id,
+            "client_private_key": client_key,
+            "worker_address": worker_address,
+        }, bridge)
+        print(f"❌ {close_error}" if close_error else "✅ Close session PASSED!")
+
+    print("\n" + "=" * 70)
+    print("TEST SUMMARY")
+    print("=" * 70)
+    print("✅ test: PASSED" if test1 else "❌ test: FAILED")
+    if success:
+        print("✅ create_session: PASSED")
+        print("❌ close_session: FAILED" if close_error else "✅ close_session: PASSED")
+    else:
+        print("❌ create_session: FAILED")
+    print("⚠️  submit_state: Known issue (timeout)")
+    return test1 and success and not close_error
+
+
+def test_bridge(bridge: BridgeClient = None):
     """Test the bridge with a simple 'test' command."""
     print("=" * 60)
     print("Test 1: Simple 'test' command")
     print("=" * 60)
     
-    request = {"command": "test"}
-    print(f"\nSending request: {json.dumps(request, indent=2)}")
+    print(f"\nSending request: {_PRETTY(_TEST_REQ)}")
     
     try:
-        response = call_bridge(request, timeout=10)
-        print(f"\nResponse: {json.dumps(response, indent=2)}")
+        response = call_bridge_raw(_TEST_BYTES, timeout=10, bridge=bridge)
+        if VERBOSE or not response.get("success"):
+            print(f"\nResponse: {_PRETTY(response)}")
         
         if response.get("success"):
             print("\n✅ Test command PASSED!")
@@ -69,15 +399,15 @@ def test_bridge():
         return False
 
 
-def test_create_session():
+def test_create_session(bridge: BridgeClient = None):
     """Test creating an app session."""
     print("\n" + "=" * 60)
     print("Test 2: Create app session")
     print("=" * 60)
     
     # Get credentials from .env or environment
-    client_key = os.getenv("PRIVATE_KEY")
-    worker_address = os.getenv("WORKER_ADDRESS")
+    client_key = CREDS.private_key
+    worker_address = CREDS.worker_address
     
     if not client_key or not worker_address:
         print("\n⚠️  Skipping create_session test:")
@@ -92,12 +422,13 @@ def test_create_session():
         "quorum": 1  # Single-party for testing
     }
     
-    print(f"\nSending request: {json.dumps({**request, 'client_private_key': '0x...'}, indent=2)}")
+    print(f"\nSending request: {_PRETTY({**request, 'client_private_key': '0x...'})}")
     print("(client_private_key hidden for security)")
     
     try:
-        response = call_bridge(request, timeout=35)
-        print(f"\nResponse: {json.dumps(response, indent=2)}")
+        response = call_bridge(request, timeout=35, bridge=bridge)
+        if VERBOSE or not response.get("success"):
+            print(f"\nResponse: {_PRETTY(response)}")
         
         if response.get("success"):
             data = response.get("data", {})
@@ -113,14 +444,14 @@ def test_create_session():
         return False, None
 
 
-def test_submit_state(app_session_id: str = None):
+def test_submit_state(app_session_id: str = None, bridge: BridgeClient = None):
     """Test submitting an escrow state update."""
     print("\n" + "=" * 60)
     print("Test 3: Submit escrow state (payment)")
     print("=" * 60)
     
-    client_key = os.getenv("PRIVATE_KEY")
-    worker_address = os.getenv("WORKER_ADDRESS")
+    client_key = CREDS.private_key
+    worker_address = CREDS.worker_address
     
     if not client_key or not worker_address:
         print("\n⚠️  Skipping submit_state test:")
@@ -139,13 +470,14 @@ def test_submit_state(app_session_id: str = None):
         "amount": "1000000",  # 1 ytest.usd (6 decimals)
     }
     
-    print(f"\nSending request: {json.dumps({**request, 'client_private_key': '0x...'}, indent=2)}")
+    print(f"\nSending request: {_PRETTY({**request, 'client_private_key': '0x...'})}")
     print("(client_private_key hidden for security)")
     print(f"Amount: 1 ytest.usd (1000000 units)")
     
     try:
-        response = call_bridge(request, timeout=35)
-        print(f"\nResponse: {json.dumps(response, indent=2)}")
+        response = call_bridge(request, timeout=35, bridge=bridge)
+        if VERBOSE or not response.get("success"):
+            print(f"\nResponse: {_PRETTY(response)}")
         
         if response.get("success"):
             data = response.get("data", {})
@@ -161,16 +493,16 @@ def test_submit_state(app_session_id: str = None):
         return False
 
 
-def test_two_party_escrow():
+def test_two_party_escrow(bridge: BridgeClient = None):
     """Test two-party escrow: create_session (quorum 2) → submit_state (client) → sign_state_worker (worker)."""
     print("\n" + "=" * 60)
     print("Test: Two-party escrow (quorum 2)")
     print("=" * 60)
 
-    client_key = os.getenv("PRIVATE_KEY")
-    worker_key = os.getenv("WORKER_PRIVATE_KEY")
-    worker_address = os.getenv("WORKER_ADDRESS")
-    client_address = os.getenv("CLIENT_ADDRESS")  # Address for PRIVATE_KEY (client)
+    client_key = CREDS.private_key
+    worker_key = CREDS.worker_private_key
+    worker_address = CREDS.worker_address
+    client_address = CREDS.client_address
 
     if not all([client_key, worker_key, worker_address, client_address]):
         print("\n⚠️  Skipping two_party_escrow test:")
@@ -189,7 +521,7 @@ def test_two_party_escrow():
         "quorum": 2,
     }
     try:
-        create_resp = call_bridge(create_req, timeout=35)
+        create_resp = call_bridge(create_req, timeout=35, bridge=bridge)
     except Exception as e:
         print(f"❌ create_session failed: {e}")
         return False
@@ -200,42 +532,42 @@ def test_two_party_escrow():
     version = create_resp.get("data", {}).get("version", 1)
     print(f"   Session: {session_id[:20]}... version={version}")
 
-    # 2) Client submits state
-    print("\n[2/3] submit_state (client signs)...")
-    submit_req = {
-        "command": "submit_state",
-        "app_session_id": session_id,
-        "client_private_key": client_key,
-        "worker_address": worker_address,
-        "amount": amount,
+    # 2+3) Client submits state, worker signs the same state: one batched bridge call.
+    # sign_state_worker takes the version submit_state returns (version_from_previous).
+    print("\n[2/3] submit_state (client signs) + [3/3] sign_state_worker (worker signs)...")
+    batch_req = {
+        "command": "batch",
+        "ops": [
+            {
+                "command": "submit_state",
+                "app_session_id": session_id,
+                "client_private_key": client_key,
+                "worker_address": worker_address,
+                "amount": amount,
+            },
+            {
+                "command": "sign_state_worker",
+                "app_session_id": session_id,
+                "worker_private_key": worker_key,
+                "client_address": client_address,
+                "worker_address": worker_address,
+                "amount": amount,
+                "version_from_previous": True,
+            },
+        ],
     }
     try:
-        submit_resp = call_bridge(submit_req, timeout=30)
+        batch_resp = call_bridge(batch_req, timeout=60, bridge=bridge)
     except Exception as e:
-        print(f"❌ submit_state failed: {e}")
+        print(f"❌ submit_state/sign_state_worker failed: {e}")
         return False
+    results = batch_resp.get("data", {}).get("results", [])
+    submit_resp = results[0] if results else batch_resp
     if not submit_resp.get("success"):
         print(f"❌ submit_state failed: {submit_resp.get('error')}")
         return False
-    next_version = submit_resp.get("data", {}).get("version")
-    print(f"   Client signed. Version for worker: {next_version}")
-
-    # 3) Worker signs same state
-    print("\n[3/3] sign_state_worker (worker signs)...")
-    worker_req = {
-        "command": "sign_state_worker",
-        "app_session_id": session_id,
-        "worker_private_key": worker_key,
-        "client_address": client_address,
-        "worker_address": worker_address,
-        "amount": amount,
-        "version": next_version,
-    }
-    try:
-        worker_resp = call_bridge(worker_req, timeout=30)
-    except Exception as e:
-        print(f"❌ sign_state_worker failed: {e}")
-        return False
+    print(f"   Client signed. Version for worker: {submit_resp.get('data', {}).get('version')}")
+    worker_resp = results[1] if len(results) > 1 else batch_resp
     if not worker_resp.get("success"):
         print(f"❌ sign_state_worker failed: {worker_resp.get('error')}")
         return False
@@ -245,117 +577,86 @@ def test_two_party_escrow():
     return True
 
 
+def test_close_session(app_session_id: str = None, bridge: BridgeClient = None):
+    """Close an app session."""
+    if not app_session_id:
+        print("⚠️  No session ID provided")
+        print("Usage: python3 test_bridge.py close_session <session_id>")
+        return False
+    client_key = CREDS.private_key
+    worker_address = CREDS.worker_address
+    if not client_key or not worker_address:
+        print("⚠️  Set PRIVATE_KEY and WORKER_ADDRESS in .env")
+        return False
+    request = {
+        "command": "close_session",
+        "app_session_id": app_session_id,
+        "client_private_key": client_key,
+        "worker_address": worker_address,
+    }
+    print(f"\nClosing session {app_session_id[:20]}...")
+    try:
+        response = call_bridge(request, timeout=35, bridge=bridge)
+        if VERBOSE or not response.get("success"):
+            print(f"\nResponse: {_PRETTY(response)}")
+        if response.get("success"):
+            print("\n✅ Close session PASSED!")
+            return True
+        else:
+            print(f"\n❌ Close session FAILED: {response.get('error')}")
+            return False
+    except Exception as e:
+        print(f"\n❌ Error: {e}")
+        return False
+
+
+def _exit_code(success) -> int:
+    return 0 if success else 1
+
+
+def _cmd_create_session(args, bridge) -> int:
+    result = test_create_session(bridge)  # None when credentials are missing
+    return _exit_code(result and result[0])
+
+
+def _cmd_all(args, bridge) -> int:
+    print("=" * 70)
+    print("COMPREHENSIVE BRIDGE TEST")
+    print("=" * 70)
+    print("\nRunning all bridge tests...\n")
+    return _exit_code(run_all(bridge))
+
+
+def _unknown(args, bridge) -> int:
+    print(f"Unknown test: {sys.argv[1]}")
+    print("Usage: python3 test_bridge.py [" + "|".join(HANDLERS) + "] [session_id]")
+    return 1
+
+
+# Subcommand -> handler(args after the subcommand, bridge) -> exit code
+HANDLERS = {
+    "test": lambda args, bridge: _exit_code(test_bridge(bridge)),
+    "create_session": _cmd_create_session,
+    "submit_state": lambda args, bridge: _exit_code(test_submit_state(args[0] if args else None, bridge)),
+    "close_session": lambda args, bridge: _exit_code(test_close_session(args[0] if args else None, bridge)),
+    "two_party": lambda args, bridge: _exit_code(test_two_party_escrow(bridge)),
+    "two_party_escrow": lambda args, bridge: _exit_code(test_two_party_escrow(bridge)),
+    "all": _cmd_all,
+}
+
+
 if __name__ == "__main__":
     # Load .env file
     load_env()
     
     test_name = sys.argv[1] if len(sys.argv) > 1 else "test"
+    handler = HANDLERS.get(test_name, _unknown)
     
-    if test_name == "test":
-        success = test_bridge()
-        sys.exit(0 if success else 1)
-    elif test_name == "create_session":
-        success, session_id = test_create_session()
-        sys.exit(0 if success else 1)
-    elif test_name == "submit_state":
-        session_id = sys.argv[2] if len(sys.argv) > 2 else None
-        success = test_submit_state(session_id)
-        sys.exit(0 if success else 1)
-    elif test_name == "close_session":
-        session_id = sys.argv[2] if len(sys.argv) > 2 else None
-        if not session_id:
-            print("⚠️  No session ID provided")
-            print("Usage: python3 test_bridge.py close_session <session_id>")
-            sys.exit(1)
-        client_key = os.getenv("PRIVATE_KEY")
-        worker_address = os.getenv("WORKER_ADDRESS")
-        if not client_key or not worker_address:
-            print("⚠️  Set PRIVATE_KEY and WORKER_ADDRESS in .env")
-            sys.exit(1)
-        request = {
-            "command": "close_session",
-            "app_session_id": session_id,
-            "client_private_key": client_key,
-            "worker_address": worker_address,
-        }
-        print(f"\nClosing session {session_id[:20]}...")
-        try:
-            response = call_bridge(request, timeout=35)
-            print(f"\nResponse: {json.dumps(response, indent=2)}")
-            if response.get("success"):
-                print("\n✅ Close session PASSED!")
-                sys.exit(0)
-            else:
-                print(f"\n❌ Close session FAILED: {response.get('error')}")
-                sys.exit(1)
-        except Exception as e:
-            print(f"\n❌ Error: {e}")
-            sys.exit(1)
-    elif test_name == "two_party" or test_name == "two_party_escrow":
-        success = test_two_party_escrow()
-        sys.exit(0 if success else 1)
-    elif test_name == "all":
-        # Run all tests in sequence
-        print("=" * 70)
-        print("COMPREHENSIVE BRIDGE TEST")
-        print("=" * 70)
-        print("\nRunning all bridge tests...\n")
-        
-        # Test 1: Test command
-        print("\n[1/4] Testing 'test' command...")
-        test1 = test_bridge()
-        
-        # Test 2: Create session
-        print("\n[2/4] Testing 'create_session'...")
-        success, session_id = test_create_session()
-        
-        # Test 3: Close session (if we have a session)
-        if success and session_id:
-            print("\n[3/4] Testing 'close_session'...")
-            request = {
-                "command": "close_session",
-                "app_session_id": session_id,
-                "client_private_key": os.getenv("PRIVATE_KEY"),
-                "worker_address": os.getenv("WORKER_ADDRESS"),
-            }
-            try:
-                response = call_bridge(request, timeout=35)
-                if response.get("success"):
-                    print("✅ Close session PASSED!")
-                else:
-                    print(f"❌ Close session FAILED: {response.get('error')}")
-            except Exception as e:
-                print(f"❌ Close session ERROR: {e}")
-        
-        # Test 4: Submit state (known issue)
-        if success and session_id:
-            print("\n[4/4] Testing 'submit_state' (known to have issues)...")
-            # Create a new session for this test
-            create_req = {
-                "command": "create_session",
-                "client_private_key": os.getenv("PRIVATE_KEY"),
-                "worker_address": os.getenv("WORKER_ADDRESS"),
-                "quorum": 1
-            }
-            try:
-                create_resp = call_bridge(create_req, timeout=35)
-                if create_resp.get("success"):
-                    test_session = create_resp.get("data", {}).get("app_session_id")
-                    test_submit_state(test_session)
-            except Exception as e:
-                print(f"⚠️  Could not test submit_state: {e}")
-        
-        print("\n" + "=" * 70)
-        print("TEST SUMMARY")
-        print("=" * 70)
-        print("✅ test: PASSED")
-        if success:
-            print("✅ create_session: PASSED")
-            print("✅ close_session: PASSED (if no errors above)")
+    with Reporter():
+        if handler is _unknown:
+            code = handler(sys.argv[2:], None)
         else:
-            print("❌ create_session: FAILED")
-        print("⚠️  submit_state: Known issue (timeout)")
-    else:
-        print(f"Unknown test: {test_name}")
-        print("Usage: python3 test_bridge.py [test|create_session|submit_state|close_session|two_party|all] [session_id]")
-        sys.exit(1)
+            # One bridge process for every call this run makes, closed when done
+            with _get_bridge() as bridge:
+                code = handler(sys.argv[2:], bridge)
+    sys.exit(code)